@@ -1,23 +1,56 @@
 """
 ChromaDB Persistent Client - Standalone Examples
 Each example can be run independently once ChromaDB is installed.
+Examples that take a ``client`` argument work with any ChromaDB client, e.g.
+``example_1_basic_setup(chromadb.PersistentClient(path="./example_db"))``.
 """
 
+import importlib.util
+
+# Only import chromadb when it is installed, so the module stays importable
+# (e.g. for reading docstrings) without it
+_HAS_CHROMA = importlib.util.find_spec("chromadb") is not None
+if _HAS_CHROMA:
+    import chromadb
+
 # ============================================================================
 # Example 1: Basic Persistent Client Setup
 # ============================================================================
 
-def example_1_basic_setup():
+def example_1_basic_setup(client):
     """
-    Basic persistent client initialization and usage.
-    """
-    import chromadb
+    Basic persistent client usage.
     
-    # Initialize persistent client
-    client = chromadb.PersistentClient(path="./example_db")
+    Uses a small hash-based embedding function so the example runs offline
+    without downloading the default MiniLM model. The vectors carry no
+    meaning; swap in a real embedding function for semantic search.
+    
+    Args:
+        client: ChromaDB client instance
+    """
+    import hashlib
+    
+    class HashEmbeddingFunction(chromadb.EmbeddingFunction):
+        """Deterministic vectors derived from a hash of each text."""
+        
+        def __init__(self, dim=128):
+            self.dim = dim
+        
+        def __call__(self, input):
+            return [
+                [b / 255.0 for b in hashlib.shake_256(text.encode("utf-8")).digest(self.dim)]
+                for text in input
+            ]
+        
+        @staticmethod
+        def name():
+            return "hash-ef"
     
     # Create a collection
-    collection = client.create_collection("my_collection")
+    collection = client.create_collection(
+        "ex1_my_collection",
+        embedding_function=HashEmbeddingFunction()
+    )
     
     # Add documents
     collection.add(
@@ -33,17 +66,21 @@ def example_1_basic_setup():
     
     print(f"Found {len(results['ids'][0])} results")
     print(results)
+    
+    client.delete_collection("ex1_my_collection")
 
 
 # ============================================================================
 # Example 2: Error Handling
 # ============================================================================
 
-def example_2_error_handling():
+def example_2_error_handling(db_path="./safe_db"):
     """
     Comprehensive error handling for production use.
+    
+    Args:
+        db_path: Path to the database directory
     """
-    import chromadb
     import logging
     
     logging.basicConfig(level=logging.INFO)
@@ -67,7 +104,7 @@ def example_2_error_handling():
     
     # Use the safe initialization
     try:
-        client = safe_client_init("./safe_db")
+        client = safe_client_init(db_path)
         print("Client initialized successfully!")
     except Exception as e:
         print(f"Failed to initialize client: {e}")
@@ -77,16 +114,15 @@ def example_2_error_handling():
 # Example 3: Collection Management
 # ============================================================================
 
-def example_3_collection_management():
+def example_3_collection_management(client):
     """
     Demonstrate collection CRUD operations.
-    """
-    import chromadb
-    
-    client = chromadb.PersistentClient(path="./collections_db")
     
+    Args:
+        client: ChromaDB client instance
+    """
     # Create a collection
-    collection = client.create_collection("my_docs")
+    collection = client.create_collection("ex3_my_docs")
     print(f"Created collection: {collection.name}")
     
     # List all collections
@@ -94,11 +130,11 @@ def example_3_collection_management():
     print(f"Available collections: {[c.name for c in collections]}")
     
     # Get existing collection
-    retrieved = client.get_collection("my_docs")
+    retrieved = client.get_collection("ex3_my_docs")
     print(f"Retrieved collection: {retrieved.name}")
     
     # Delete collection
-    client.delete_collection("my_docs")
+    client.delete_collection("ex3_my_docs")
     print("Collection deleted")
     
     # Verify deletion
@@ -110,15 +146,21 @@ def example_3_collection_management():
 # Example 4: Persistence Verification
 # ============================================================================
 
-def example_4_persistence_verification():
+def example_4_persistence_verification(db_path="./persistence_test_db"):
     """
     Verify that data persists across client sessions.
-    """
-    import chromadb
-    import os
     
-    db_path = "./persistence_test_db"
+    Closing a client is less obvious than it looks: Chroma keeps one open
+    system per path and hands it to every client created for that path, so
+    ``del client`` alone leaves SQLite open and the "second session" just
+    reads the first one's in-memory state. Session 1 is therefore stopped
+    and evicted explicitly before session 2 reopens the database from disk.
+    If this ChromaDB version does not allow that, the example says the
+    cross-session check was not verified.
     
+    Args:
+        db_path: Path to the database directory
+    """
     # Session 1: Create and populate
     print("Session 1: Creating data...")
     client1 = chromadb.PersistentClient(path=db_path)
@@ -128,7 +170,17 @@ def example_4_persistence_verification():
         ids=["session1_doc"]
     )
     print(f"  Added {collection1.count()} document(s)")
-    del client1  # Explicitly delete to close
+    
+    # End session 1: evict its system from Chroma's per-path cache, then
+    # stop it. Evicting first means a stopped system is never left cached.
+    try:
+        system = type(client1)._identifier_to_system.pop(client1._identifier)
+    except (AttributeError, KeyError):
+        evicted = False  # Internals differ in this version
+    else:
+        system.stop()
+        evicted = True
+    del collection1, client1
     
     # Session 2: Retrieve data
     print("\nSession 2: Retrieving data...")
@@ -138,21 +190,25 @@ def example_4_persistence_verification():
     
     results = collection2.get(ids=["session1_doc"])
     print(f"  Retrieved: {results['documents'][0]}")
-    print("\n Data persisted successfully!")
+    if evicted:
+        print("\n Data persisted successfully!")
+    else:
+        print("\n Session 2 reused session 1's open database; "
+              "cross-session persistence was not verified")
 
 
 # ============================================================================
 # Example 5: Metadata and Filtering
 # ============================================================================
 
-def example_5_metadata_filtering():
+def example_5_metadata_filtering(client):
     """
     Demonstrate metadata usage and filtering.
-    """
-    import chromadb
     
-    client = chromadb.PersistentClient(path="./metadata_db")
-    collection = client.create_collection("docs_with_metadata")
+    Args:
+        client: ChromaDB client instance
+    """
+    collection = client.create_collection("ex5_docs_with_metadata")
     
     # Add documents with metadata
     collection.add(
@@ -181,40 +237,94 @@ def example_5_metadata_filtering():
     print(f"Found {len(results['ids'][0])} Python documents")
     for doc, metadata in zip(results['documents'][0], results['metadatas'][0]):
         print(f"  - {doc[:40]}... (Level: {metadata['level']})")
+    
+    client.delete_collection("ex5_docs_with_metadata")
 
 
 # ============================================================================
 # Example 6: Batch Operations
 # ============================================================================
 
-def example_6_batch_operations():
+def example_6_batch_operations(client, batch_size=250, fast_bulk=False):
     """
     Efficiently add large numbers of documents.
+    
+    Args:
+        client: ChromaDB persistent client instance
+        batch_size: Number of documents sent per collection.add() call
+        fast_bulk: Disable SQLite journaling and fsync during the insert
+            (see persistent_client_demo.fast_bulk_load). Much faster, but a
+            crash mid-insert, or any failed statement that rolls back (ROLLBACK
+            is undefined without a journal), can corrupt the database, so only
+            use it for data that can be reloaded. Requires chromadb < 1.0.
     """
-    import chromadb
     import time
+    from contextlib import nullcontext
+    import numpy as np
     
-    client = chromadb.PersistentClient(path="./batch_db")
-    collection = client.create_collection("large_collection")
+    # Cheaper HNSW build than the defaults (construction_ef=100, M=16).
+    # Halving M roughly halves graph memory and insert time, typically at a
+    # cost of a few points of recall@10; raise these again for production.
+    collection = client.create_collection(
+        "ex6_large_collection",
+        metadata={
+            "hnsw:space": "cosine",
+            "hnsw:construction_ef": 64,
+            "hnsw:M": 8,
+            "hnsw:search_ef": 32,
+        }
+    )
     
-    # Prepare large batch
+    # Prepare large batch (vectorised with NumPy instead of per-row f-strings)
     num_docs = 1000
-    documents = [f"Document {i} with some content" for i in range(num_docs)]
-    ids = [f"doc_{i}" for i in range(num_docs)]
-    metadatas = [{"index": i, "category": i % 10} for i in range(num_docs)]
+    index = np.arange(num_docs)
+    index_str = index.astype(str)
+    documents = np.char.add(np.char.add("Document ", index_str), " with some content").tolist()
+    ids = np.char.add("doc_", index_str).tolist()
+    # Modulo runs once over the whole array instead of once per row
+    categories = (index % 10).tolist()
+    metadatas = [{"index": i, "category": c} for i, c in enumerate(categories)]
+    
+    # Embed once up front in batched forward passes (same model as Chroma's
+    # default), so add() only has to write to SQLite and the HNSW index
+    try:
+        from sentence_transformers import SentenceTransformer
+    except ImportError:
+        print("sentence-transformers not installed; Chroma will embed during add()")
+        embeddings = None
+    else:
+        model = SentenceTransformer("all-MiniLM-L6-v2")
+        embeddings = model.encode(
+            documents,
+            batch_size=64,
+            convert_to_numpy=True,
+            show_progress_bar=False
+        ).astype("float32").tolist()
+    
+    if fast_bulk:
+        from persistent_client_demo import fast_bulk_load
+        bulk_context = fast_bulk_load(client)
+    else:
+        bulk_context = nullcontext()
     
     # Time the batch insert
-    start = time.time()
-    collection.add(
-        documents=documents,
-        ids=ids,
-        metadatas=metadatas
-    )
-    elapsed = time.time() - start
+    # Chroma recommends batches of roughly 50-250 documents per add() call
+    with bulk_context:
+        start = time.perf_counter_ns()
+        for s in range(0, num_docs, batch_size):
+            collection.add(
+                documents=documents[s:s + batch_size],
+                ids=ids[s:s + batch_size],
+                metadatas=metadatas[s:s + batch_size],
+                embeddings=embeddings[s:s + batch_size] if embeddings else None
+            )
+        elapsed = (time.perf_counter_ns() - start) / 1e9
     
     print(f"Added {num_docs} documents in {elapsed:.2f} seconds")
     print(f"Rate: {num_docs/elapsed:.0f} documents/second")
     print(f"Collection count: {collection.count()}")
+    
+    client.delete_collection("ex6_large_collection")
 
 
 # ============================================================================
@@ -224,10 +334,9 @@ def example_6_batch_operations():
 def example_7_update_delete():
     """
     Demonstrate update and delete operations.
+    Uses an in-memory client since nothing here needs to outlive the run.
     """
-    import chromadb
-    
-    client = chromadb.PersistentClient(path="./update_db")
+    client = chromadb.Client()
     collection = client.create_collection("mutable_docs")
     
     # Add initial documents
@@ -255,85 +364,317 @@ def example_7_update_delete():
 # Example 8: Custom Embedding Functions
 # ============================================================================
 
-def example_8_custom_embeddings():
+def example_8_custom_embeddings(client):
     """
-    Using custom embedding functions.
+    Using a custom embedding model.
+    
+    The model is loaded once and encodes all documents in a single batched
+    call; the resulting vectors are passed straight to add() and query()
+    instead of letting Chroma call an embedding function per request.
+    
+    Args:
+        client: ChromaDB client instance
     """
-    import chromadb
-    from chromadb.utils import embedding_functions
+    from sentence_transformers import SentenceTransformer
     
-    # Use different embedding function
-    sentence_transformer_ef = embedding_functions.SentenceTransformerEmbeddingFunction(
-        model_name="all-MiniLM-L6-v2"
-    )
+    model = SentenceTransformer("all-MiniLM-L6-v2")
     
-    client = chromadb.PersistentClient(path="./custom_embeddings_db")
-    collection = client.create_collection(
-        name="custom_embeddings",
-        embedding_function=sentence_transformer_ef
-    )
+    collection = client.create_collection(name="ex8_custom_embeddings")
+    
+    documents = ["The cat sat on the mat", "The dog played in the park"]
+    doc_embeddings = model.encode(
+        documents,
+        batch_size=32,
+        convert_to_numpy=True
+    ).tolist()
     
     collection.add(
-        documents=["The cat sat on the mat", "The dog played in the park"],
-        ids=["cat_doc", "dog_doc"]
+        documents=documents,
+        ids=["cat_doc", "dog_doc"],
+        embeddings=doc_embeddings
     )
     
+    # Reuse the same model for the query embedding
+    query_embeddings = model.encode(["feline on furniture"]).tolist()
     results = collection.query(
-        query_texts=["feline on furniture"],
+        query_embeddings=query_embeddings,
         n_results=1
     )
     
     print(f"Query: 'feline on furniture'")
     print(f"Best match: {results['documents'][0][0]}")
+    
+    client.delete_collection("ex8_custom_embeddings")
 
 
 # ============================================================================
-# Main Function - Run All Examples
+# Example 9: Precomputed Embeddings
 # ============================================================================
 
-def main():
+def example_9_precomputed_embeddings(client, dim=384):
     """
-    Run all examples sequentially.
-    Comment out any you don't want to run.
+    Insert vectors computed outside ChromaDB, skipping the embedding function.
+    
+    Embedding dimension is the main driver of insert cost: every vector is
+    stored as a BLOB and indexed in HNSW, so prefer the smallest dimension
+    that gives acceptable recall. 384 matches all-MiniLM-L6-v2.
+    
+    Args:
+        client: ChromaDB client instance
+        dim: Embedding dimension
+    """
+    import numpy as np
+    
+    collection = client.create_collection("ex9_precomputed")
+    
+    num_docs = 1000
+    ids = [f"vec_{i}" for i in range(num_docs)]
+    documents = [f"Precomputed document {i}" for i in range(num_docs)]
+    
+    # Convert to float32 first; .tolist() then yields Python floats, which
+    # ChromaDB requires, but it is the stored dimension that drives the cost
+    vectors = np.random.rand(num_docs, dim).astype(np.float32)
+    embeddings = vectors.tolist()
+    
+    batch_size = 250
+    for s in range(0, num_docs, batch_size):
+        collection.add(
+            ids=ids[s:s + batch_size],
+            embeddings=embeddings[s:s + batch_size],
+            documents=documents[s:s + batch_size]
+        )
+    print(f"Added {collection.count()} documents with {dim}-dim embeddings")
+    
+    # Queries must also pass embeddings of the same dimension
+    results = collection.query(
+        query_embeddings=[embeddings[0]],
+        n_results=3
+    )
+    print(f"Nearest to {ids[0]}: {results['ids'][0]}")
+    
+    client.delete_collection("ex9_precomputed")
+
+
+# ============================================================================
+# Example 10: Selective Metadata Filtering
+# ============================================================================
+
+def example_10_selective_filtering(client, dim=384):
     """
-    examples = [
-        ("Basic Setup", example_1_basic_setup),
-        ("Error Handling", example_2_error_handling),
-        ("Collection Management", example_3_collection_management),
-        ("Persistence Verification", example_4_persistence_verification),
-        ("Metadata and Filtering", example_5_metadata_filtering),
-        ("Batch Operations", example_6_batch_operations),
-        ("Update and Delete", example_7_update_delete),
-        # ("Custom Embeddings", example_8_custom_embeddings),  # Requires additional package
+    Filter a larger collection down to a small, selective subset.
+    
+    A selective ``where`` clause is answered from Chroma's metadata index,
+    so its cost scales with the number of matches. Non-selective filters
+    still materialise every matching row in memory before ranking.
+    
+    Args:
+        client: ChromaDB client instance
+        dim: Embedding dimension
+    """
+    import numpy as np
+    
+    collection = client.create_collection("ex10_selective_filter")
+    
+    # 50 "rare" documents hidden among 10,000
+    num_docs = 10000
+    num_rare = 50
+    ids = [f"doc_{i}" for i in range(num_docs)]
+    metadatas = [
+        {"category": "rare" if i < num_rare else "common"}
+        for i in range(num_docs)
     ]
+    # Random vectors keep the example about filtering, not embedding
+    embeddings = np.random.rand(num_docs, dim).astype(np.float32).tolist()
+    
+    batch_size = 250
+    for s in range(0, num_docs, batch_size):
+        collection.add(
+            ids=ids[s:s + batch_size],
+            embeddings=embeddings[s:s + batch_size],
+            metadatas=metadatas[s:s + batch_size]
+        )
+    print(f"Added {collection.count()} documents ({num_rare} rare)")
+    
+    # Selective filter: hits the metadata index, only 50 candidates to rank
+    results = collection.query(
+        query_embeddings=np.random.rand(1, dim).astype(np.float32).tolist(),
+        n_results=10,
+        where={"category": "rare"}
+    )
+    
+    print(f"Found {len(results['ids'][0])} rare documents")
+    print(f"  All rare: {all(m['category'] == 'rare' for m in results['metadatas'][0])}")
     
-    for name, func in examples:
+    client.delete_collection("ex10_selective_filter")
+
+
+# ============================================================================
+# Example 11: Async Batch Inserts
+# ============================================================================
+
+def example_11_async_batch(host="localhost", port=8000):
+    """
+    Non-blocking batch inserts against a Chroma server with AsyncHttpClient.
+    
+    Batches are submitted concurrently with asyncio.gather, so network and
+    server-side commits overlap instead of running one after another.
+    Requires a server started with ``chroma run``.
+    
+    Args:
+        host: Chroma server host
+        port: Chroma server port
+    """
+    import asyncio
+    import httpx
+    
+    num_docs = 1000
+    batch_size = 250
+    ids = [f"doc_{i}" for i in range(num_docs)]
+    documents = [f"Document {i} with some content" for i in range(num_docs)]
+    
+    async def run():
+        try:
+            client = await chromadb.AsyncHttpClient(host=host, port=port)
+        except (httpx.ConnectError, ValueError) as e:
+            # Depending on the version, ChromaDB either raises the httpx error
+            # directly or wraps it in a ValueError
+            print(f"Could not reach a Chroma server at {host}:{port}: {e}")
+            print("Start one with: chroma run --path ./chroma_server_db")
+            return
+        
+        batches = [
+            (ids[s:s + batch_size], documents[s:s + batch_size])
+            for s in range(0, num_docs, batch_size)
+        ]
+        collection = await client.get_or_create_collection("ex11_async_demo")
+        try:
+            await asyncio.gather(*[
+                collection.add(ids=batch_ids, documents=batch_docs)
+                for batch_ids, batch_docs in batches
+            ])
+            print(f"Added {await collection.count()} documents in {len(batches)} concurrent batches")
+        finally:
+            # Don't leave the collection behind on the server if add() fails
+            await client.delete_collection("ex11_async_demo")
+    
+    asyncio.run(run())
+
+
+# ============================================================================
+# Main Function - Run All Examples
+# ============================================================================
+
+# Per-process state for examples run through main()
+_worker_db_root = None
+_worker_client = None
+
+
+def _init_worker(db_root):
+    """
+    Record where this worker process keeps its database.
+    
+    The client itself is opened lazily by _get_worker_client(), so a failure
+    to open it is reported by the example that needed it.
+    """
+    global _worker_db_root
+    _worker_db_root = db_root
+
+
+def _get_worker_client():
+    """
+    Return this worker's PersistentClient, opening it on first use.
+    
+    Each worker gets its own directory under the database root, since a
+    persistent database only supports a single writer process.
+    """
+    import os
+    
+    global _worker_client
+    if _worker_client is None:
+        _worker_client = chromadb.PersistentClient(
+            path=os.path.join(_worker_db_root, f"worker_{os.getpid()}")
+        )
+    return _worker_client
+
+
+def _run_example(example):
+    """
+    Run one (name, func, needs_client) entry and return its captured output.
+    Both stdout and stderr (logging, Chroma warnings) are captured so each
+    example's output stays together.
+    """
+    import io
+    from contextlib import redirect_stderr, redirect_stdout
+    
+    name, func, needs_client = example
+    output = io.StringIO()
+    with redirect_stdout(output), redirect_stderr(output):
         print("\n" + "=" * 60)
         print(f"Example: {name}")
         print("=" * 60)
         try:
-            func()
+            if needs_client:
+                func(_get_worker_client())
+            else:
+                func()
             print(f"\n {name} completed successfully")
         except Exception as e:
             print(f"\n {name} failed: {e}")
         print()
-    
-    # Cleanup example databases
-    import shutil
+    return output.getvalue()
+
+
+def main():
+    """
+    Run all examples in parallel across a process pool.
+    Comment out any you don't want to run.
+    Examples that take a client share their worker's PersistentClient, so
+    each database is only opened once per process. Output is printed in
+    example order once each example finishes.
+    All databases live in a temporary directory that is removed on exit,
+    even if an example crashes.
+    """
     import os
-    cleanup_dirs = [
-        "./example_db", "./safe_db", "./collections_db",
-        "./persistence_test_db", "./metadata_db", "./batch_db",
-        "./update_db", "./custom_embeddings_db"
-    ]
-    print("\n" + "=" * 60)
-    print("Cleanup")
-    print("=" * 60)
-    for dir_path in cleanup_dirs:
-        if os.path.exists(dir_path):
-            shutil.rmtree(dir_path)
-            print(f"  Removed: {dir_path}")
-    print("\n Cleanup complete")
+    import tempfile
+    from concurrent.futures import ProcessPoolExecutor
+    from functools import partial
+    
+    with tempfile.TemporaryDirectory(prefix="chroma_examples_") as tmp:
+        safe_db = os.path.join(tmp, "safe_db")
+        persistence_db = os.path.join(tmp, "persistence_test_db")
+        
+        examples = [
+            ("Basic Setup", example_1_basic_setup, True),
+            ("Error Handling", partial(example_2_error_handling, safe_db), False),
+            ("Collection Management", example_3_collection_management, True),
+            ("Persistence Verification", partial(example_4_persistence_verification, persistence_db), False),
+            ("Metadata and Filtering", example_5_metadata_filtering, True),
+            ("Batch Operations", example_6_batch_operations, True),
+            ("Update and Delete", example_7_update_delete, False),
+            # ("Custom Embeddings", example_8_custom_embeddings, True),  # Requires additional package
+            ("Precomputed Embeddings", example_9_precomputed_embeddings, True),
+            ("Selective Filtering", example_10_selective_filtering, True),
+            # ("Async Batch", example_11_async_batch, False),  # Requires a running Chroma server
+        ]
+        
+        # Download the default embedding model once up front; otherwise
+        # workers race to fetch and unpack it into the same cache directory
+        try:
+            from chromadb.utils import embedding_functions
+            embedding_functions.DefaultEmbeddingFunction()(["warmup"])
+        except Exception as e:
+            print(f"Could not prepare the default embedding model: {e}")
+        
+        max_workers = min(len(examples), os.cpu_count() or 1)
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(tmp,)
+        ) as executor:
+            for output in executor.map(_run_example, examples):
+                print(output, end="")
+    
+    print("\n Example databases removed")
 
 
 if __name__ == "__main__":
@@ -343,11 +684,10 @@ if __name__ == "__main__":
     print("  pip install chromadb")
     print("=" * 60)
     
-    try:
-        import chromadb
+    if _HAS_CHROMA:
         print(f"\n ChromaDB {chromadb.__version__} is installed\n")
         main()
-    except ImportError:
+    else:
         print("\n ChromaDB is not installed")
         print("Please install it with: pip install chromadb")
         print("See INSTALLATION_NOTES.md for detailed instructions")
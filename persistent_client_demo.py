@@ -5,9 +5,27 @@ collection management, and database utilities.
 """
 
 import chromadb
+import chromadb.errors
 import os
 import shutil
 import time
+from contextlib import contextmanager, nullcontext
+
+
+# SQLite settings for bulk loads, trading durability for insert speed
+BULK_LOAD_PRAGMAS = {
+    "journal_mode": "off",
+    "synchronous": "off",
+    "temp_store": "memory",
+    "locking_mode": "exclusive",
+}
+
+# Raised by delete_collection() for a missing collection: NotFoundError on
+# newer chromadb releases, ValueError on older ones
+COLLECTION_NOT_FOUND_ERRORS = tuple(
+    exc for exc in (getattr(chromadb.errors, "NotFoundError", None), ValueError)
+    if exc is not None
+)
 
 
 def initialize_persistent_client(path="./my_vector_db"):
@@ -105,10 +123,73 @@ def reset_database(db_path):
     return client
 
 
-def performance_comparison():
+@contextmanager
+def fast_bulk_load(client):
+    """
+    Temporarily apply BULK_LOAD_PRAGMAS to a persistent client's SQLite connection.
+    
+    With journaling and fsync disabled, a crash or power loss during the load
+    can leave the database corrupted. Without a journal SQLite's ROLLBACK is
+    also undefined, so any statement that fails and rolls back inside the
+    block can corrupt the database even without a crash. Only use this for
+    data that can be rebuilt from source. The previous PRAGMA values are
+    restored on exit.
+    
+    Relies on the Python SQLite backend of chromadb < 1.0; on newer versions
+    (or if the connection pool is not exposed) the block runs with the
+    default settings.
+    
+    Args:
+        client: ChromaDB persistent client instance
+    """
+    # chromadb >= 1.0 manages SQLite from Rust and exposes no connection pool
+    sysdb = None
+    if int(chromadb.__version__.split(".")[0]) < 1:
+        sysdb = getattr(getattr(client, "_server", None), "_sysdb", None)
+    if sysdb is None:
+        print("  - Fast bulk load not supported by this ChromaDB version")
+        yield
+        return
+    
+    conn = sysdb._conn_pool.connect()
+    previous = {}
+    try:
+        for name, value in BULK_LOAD_PRAGMAS.items():
+            previous[name] = conn.execute(f"PRAGMA {name}").fetchone()[0]
+            conn.execute(f"PRAGMA {name} = {value}")
+        yield
+    finally:
+        for name, value in previous.items():
+            conn.execute(f"PRAGMA {name} = {value}")
+
+
+def fresh_collection(client, collection_name):
+    """
+    Drop any leftover collection from a previous run and return an empty one.
+    
+    Args:
+        client: ChromaDB client instance
+        collection_name: Name of the collection to recreate
+        
+    Returns:
+        Collection: An empty collection
+    """
+    try:
+        client.delete_collection(collection_name)
+    except COLLECTION_NOT_FOUND_ERRORS:
+        pass  # Nothing left over from a previous run
+    return client.get_or_create_collection(collection_name)
+
+
+def performance_comparison(fast_bulk=False):
     """
     Compare performance between ephemeral and persistent clients.
-    Tests collection creation and document insertion operations.
+    Tests document insertion into a freshly created collection; collection
+    setup happens before the timer starts.
+    
+    Args:
+        fast_bulk: Insert into the persistent client under fast_bulk_load(),
+            which disables SQLite journaling and fsync for the duration
     """
     print("\n--- Performance Comparison ---")
     
@@ -122,14 +203,15 @@ def performance_comparison():
     print("\nTesting Ephemeral Client:")
     memory_client = chromadb.Client()
     
-    start = time.time()
-    mem_collection = memory_client.create_collection("perf_test_memory")
+    mem_collection = fresh_collection(memory_client, "perf_test_memory")
+    
+    start = time.perf_counter_ns()
     mem_collection.add(
         documents=test_docs,
         ids=test_ids,
         metadatas=test_metadata
     )
-    mem_time = time.time() - start
+    mem_time = (time.perf_counter_ns() - start) / 1e9
     print(f"  - Collection created with {mem_collection.count()} documents")
     print(f"  - Operation time: {mem_time:.3f}s")
     
@@ -137,14 +219,18 @@ def performance_comparison():
     print("\nTesting Persistent Client:")
     persistent_client = chromadb.PersistentClient(path="./perf_test")
     
-    start = time.time()
-    pers_collection = persistent_client.create_collection("perf_test_persistent")
-    pers_collection.add(
-        documents=test_docs,
-        ids=test_ids,
-        metadatas=test_metadata
-    )
-    pers_time = time.time() - start
+    pers_collection = fresh_collection(persistent_client, "perf_test_persistent")
+    bulk_context = fast_bulk_load(persistent_client) if fast_bulk else nullcontext()
+    
+    # Apply/restore PRAGMAs outside the timed region
+    with bulk_context:
+        start = time.perf_counter_ns()
+        pers_collection.add(
+            documents=test_docs,
+            ids=test_ids,
+            metadatas=test_metadata
+        )
+        pers_time = (time.perf_counter_ns() - start) / 1e9
     print(f"  - Collection created with {pers_collection.count()} documents")
     print(f"  - Operation time: {pers_time:.3f}s")
     